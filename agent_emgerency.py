@@ -1,24 +1,32 @@
-import spacy
+import asyncio
 import datetime
 import json
 import os
+import re
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 from livekit import agents
-from livekit.agents import AgentSession, JobContext, WorkerOptions, cli, function_tool, room_io
+from livekit.agents import AgentSession, JobContext, JobProcess, WorkerOptions, cli, function_tool, room_io
 from livekit.plugins import silero, noise_cancellation
 
-# Custom plugin imports
-from plugins.tts.indic_tts import TTS as IndicTTS, SUPPORTED_LANGUAGES 
-from plugins.stt.aibharath_conformer_stt import STT as IndicConformerSTT
-
-# Load Spacy
+# Prefer uvloop when installed. Set at import so job processes, which
+# re-import this module when spawned, pick it up as well.
 try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Warning: Spacy model 'en_core_web_sm' not found. Run: python -m spacy download en_core_web_sm")
-    nlp = None
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Custom plugin imports (only the language table is needed while the session
+# runs on hosted models; the local STT module would pull in numpy at import)
+from plugins.tts.indic_tts import SUPPORTED_LANGUAGES
+from plugins._http import close_session
 
 # Configuration
 JSON_DIR = Path("conversation_json")
@@ -27,11 +35,16 @@ DB_FILE = Path("emergency_data.db")
 # Create directories if they don't exist
 JSON_DIR.mkdir(exist_ok=True)
 
+
+def incident_json_path(ticket_id: str) -> Path:
+    """Location of the conversation JSON written for a ticket."""
+    return JSON_DIR / f"incident_{ticket_id}.json"
+
 load_dotenv()
 
 DEFAULT_LANGUAGE = "en"
 
-LANGUAGE_MAP = {
+LANGUAGE_MAP = MappingProxyType({
     "english": "en", "en": "en",
     "hindi": "hi", "hi": "hi", "हिंदी": "hi",
     "kannada": "kn", "kn": "kn", "ಕನ್ನಡ": "kn",
@@ -39,15 +52,69 @@ LANGUAGE_MAP = {
     "marathi": "mr", "mr": "mr", "मराठी": "mr",
     "tamil": "ta", "ta": "ta", "தமிழ்": "ta",
     "telugu": "te", "te": "te", "తెలుగు": "te",
-}
+})
+
+
+# Language names (not 2-letter codes, which collide with words like "hi") for
+# spotting a language mention inside a free-form phrase, longest first
+_LANGUAGE_MENTION_RE = re.compile(
+    r"(?<![a-z])("
+    + "|".join(re.escape(k) for k in sorted(LANGUAGE_MAP, key=len, reverse=True) if len(k) > 2)
+    + r")(?![a-z])"
+)
+
+
+def detect_lang(utterance: str) -> str | None:
+    """Return the code of the first language named in the utterance, if any."""
+    match = _LANGUAGE_MENTION_RE.search(utterance.casefold())
+    return LANGUAGE_MAP[match.group(1)] if match else None
+
+
+@lru_cache(maxsize=64)
+def _normalize_lang(language: str) -> str:
+    """Map a language name/code spoken by the caller to its ISO code."""
+    key = language.casefold().strip()
+    if key in LANGUAGE_MAP:
+        return LANGUAGE_MAP[key]
+    # e.g. "mujhe hindi chahiye" -> "hi"
+    return detect_lang(key) or DEFAULT_LANGUAGE
 
 class SQLiteManager:
     """Handles SQLite Operations with Debug Logging"""
+    # Column names match the CREATE TABLE statement (snake_case); built once so
+    # sqlite3's statement cache reuses the compiled bytecode on every insert
+    _insert_sql = """
+        INSERT INTO incidents
+        (ticket_id, timestamp, caller_name, location, incident_type, classification, confidence, priority, sentiment, description, language, json_file_path)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def __init__(self, db_path):
         self.db_path = db_path
+        # One long-lived connection per worker process, opened on first write
+        # from the writer thread; the lock serialises writer threads
+        self.conn = None
+        self._conn_pid = None
+        self._lock = threading.Lock()
+        # Single writer thread: async callers queue behind it instead of
+        # spinning up default-pool threads that would only contend on the lock
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
         self.init_db()
 
+    def _connect(self):
+        # A connection must not cross fork(): a forked job process opens its own
+        if self.conn is None or self._conn_pid != os.getpid():
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn_pid = os.getpid()
+            # WAL + NORMAL: one fsync per checkpoint instead of two per commit
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+        return self.conn
+
     def init_db(self):
+        # Short-lived connection: this runs at import, before workers fork
+        conn = None
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -69,25 +136,37 @@ class SQLiteManager:
                     json_file_path TEXT
                 )
             """)
+            # Dashboard queries filter/sort by time and priority
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_incidents_timestamp ON incidents(timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_incidents_priority_timestamp ON incidents(priority, timestamp)")
             conn.commit()
-            conn.close()
             print(f"[SYSTEM] Database initialized at {self.db_path}")
         except Exception as e:
             print(f"[ERROR] Database initialization failed: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
 
-    def insert_incident(self, data: dict, json_path: str):
+    def insert_incident(self, data: dict):
         print(f"[DB] Attempting to write ticket {data.get('ticket_id')} to database...")
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # FIXED: Column names match the CREATE TABLE statement (snake_case)
-            query = """
-                INSERT INTO incidents 
-                (ticket_id, timestamp, caller_name, location, incident_type, classification, confidence, priority, sentiment, description, language, json_file_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            cursor.execute(query, (
+            with self._lock:
+                self._write_incident(data)
+            print(f"[DB] Successfully written ticket {data['ticket_id']}")
+            return "Success: Written to SQLite"
+        except Exception as e:
+            print(f"[DB ERROR] Failed to write ticket: {e}")
+            return f"DB Error: {str(e)}"
+
+    async def ainsert_incident(self, data: dict):
+        """insert_incident on the writer thread, without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.insert_incident, data)
+
+    def _write_incident(self, data: dict):
+        conn = self._connect()
+        try:
+            conn.execute(self._insert_sql, (
                 data['ticket_id'],
                 data['timestamp'],
                 data['name'],          # Maps to caller_name column
@@ -99,31 +178,33 @@ class SQLiteManager:
                 data['sentiment'],
                 data['description'],
                 data['language'],
-                json_path
+                str(incident_json_path(data['ticket_id']))
             ))
             conn.commit()
-            conn.close()
-            print(f"[DB] Successfully written ticket {data['ticket_id']}")
-            return "Success: Written to SQLite"
-        except Exception as e:
-            print(f"[DB ERROR] Failed to write ticket: {e}")
-            return f"DB Error: {str(e)}"
+        except Exception:
+            conn.rollback()
+            raise
 
 # Initialize DB Manager globally
 db_manager = SQLiteManager(DB_FILE)
 
-class IndicAssistant(agents.Agent):
-    def __init__(self):
-        lang_list = ", ".join([info["name"] for info in SUPPORTED_LANGUAGES.values()])
-        
-        super().__init__(
-            instructions=f"""
+
+def _write_json(path: Path, data: dict):
+    # One dumps + one write instead of json.dump's many small writes; indent=4
+    # keeps the file readable but runs the pure-Python encoder, not the C one
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8")
+
+
+# Built once at import; the language list comes from a constant table
+_SUPPORTED_LANG_NAMES = ", ".join(info["name"] for info in SUPPORTED_LANGUAGES.values())
+
+INSTRUCTIONS = f"""
             ROLE:
             You are a Senior Emergency Control Officer for the Indian National Emergency Helpline (112). 
             
             STEP 0: LANGUAGE PROTOCOL (ABSOLUTE PRIORITY)
             - Before doing anything else, you must identify the caller's language.
-            - Supported languages are: {lang_list}.
+            - Supported languages are: {_SUPPORTED_LANG_NAMES}.
             - Ask the user to select their language if unsure, or detect it from their first words.
             - Call the 'set_language' tool ONCE and ONLY ONCE immediately after detection.
             - Do not proceed to triage until the language is set.
@@ -162,11 +243,30 @@ class IndicAssistant(agents.Agent):
             - Read Ticket ID.
             - Call 'disconnect_call'.
             """
-        )
+
+
+class IndicAssistant(agents.Agent):
+    def __init__(self):
+        super().__init__(instructions=INSTRUCTIONS)
         self.current_language = DEFAULT_LANGUAGE
         self._language_set = False
         self._report_submitted = False
-        self.conversation_history = []
+        # Turns stored column-wise; rows are only built once, at submission
+        self._turn_roles = []
+        self._turn_contents = []
+        self._turn_timestamps = []
+
+    def add_turn(self, role: str, content: str):
+        self._turn_roles.append(role)
+        self._turn_contents.append(content)
+        # Raw epoch seconds; formatted to ISO only when the log is built
+        self._turn_timestamps.append(time.time())
+
+    def conversation_log(self) -> list:
+        return [
+            {"role": r, "content": c, "timestamp": datetime.datetime.fromtimestamp(t).isoformat()}
+            for r, c, t in zip(self._turn_roles, self._turn_contents, self._turn_timestamps)
+        ]
 
     @function_tool()
     async def detect_call_intent(self, context: agents.RunContext, user_statement: str):
@@ -177,14 +277,22 @@ class IndicAssistant(agents.Agent):
         if self._language_set:
             return "Language already set."
         
-        lang_code = LANGUAGE_MAP.get(language.lower().strip(), "en")
-        session = context.session
-        if session.tts:
-            try: session.tts.update_options(language=lang_code)
-            except: pass
-        if session.stt:
-            try: session.stt.update_options(language=lang_code, translate_to_english=True)
-            except: pass
+        lang_code = _normalize_lang(language)
+        # Plugins are already configured for the default language
+        if lang_code != self.current_language:
+            session = context.session
+            tts = session.tts
+            if tts is not None and hasattr(tts, "update_options"):
+                try:
+                    tts.update_options(language=lang_code)
+                except Exception as e:
+                    print(f"[WARN] TTS language update failed: {e}")
+            stt = session.stt
+            if stt is not None and hasattr(stt, "update_options"):
+                try:
+                    stt.update_options(language=lang_code, translate_to_english=True)
+                except Exception as e:
+                    print(f"[WARN] STT language update failed: {e}")
 
         self.current_language = lang_code
         self._language_set = True
@@ -207,8 +315,9 @@ class IndicAssistant(agents.Agent):
             return "Report already submitted."
 
         # Generate Ticket ID with Microseconds to prevent collisions
-        ticket_id = f"INC-{datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')}"
-        timestamp = datetime.datetime.now().isoformat()
+        now = datetime.datetime.now()
+        ticket_id = f"INC-{now:%Y%m%d%H%M%S%f}"
+        timestamp = now.isoformat()
         
         print(f"[TOOL] submit_emergency_report called for {ticket_id}")
 
@@ -226,35 +335,26 @@ class IndicAssistant(agents.Agent):
             "language": self.current_language
         }
 
-        # 1. Save JSON File
-        json_filename = JSON_DIR / f"incident_{ticket_id}.json"
+        # Persist the JSON record and the DB row in parallel from the in-memory data
+        json_filename = incident_json_path(ticket_id)
         conversation_data = {
             "metadata": db_data,
-            "conversation_log": self.conversation_history
+            # Built here on the loop, so it is a snapshot for the writer thread
+            "conversation_log": self.conversation_log()
         }
-        
-        try:
-            with open(json_filename, "w", encoding="utf-8") as f:
-                json.dump(conversation_data, f, ensure_ascii=False, indent=4)
-            print(f"[FILE] JSON saved to {json_filename}")
-        except Exception as e:
-            print(f"[ERROR] Failed to save JSON: {e}")
 
-        # 2. Extract Metadata from the JSON File (as requested)
-        extracted_metadata = {}
-        try:
-            with open(json_filename, "r", encoding="utf-8") as f:
-                loaded_json = json.load(f)
-                extracted_metadata = loaded_json.get("metadata")
-                print(f"[FILE] Metadata extracted from JSON successfully.")
-        except Exception as e:
-            print(f"[ERROR] Failed to read JSON for metadata extraction: {e}")
-            # Fallback to in-memory data if file read fails
-            extracted_metadata = db_data
+        json_result, db_result = await asyncio.gather(
+            asyncio.to_thread(_write_json, json_filename, conversation_data),
+            db_manager.ainsert_incident(db_data),
+            return_exceptions=True,
+        )
+        if isinstance(json_result, Exception):
+            print(f"[ERROR] Failed to save JSON: {json_result}")
+        else:
+            print(f"[FILE] JSON saved to {json_filename}")
+        if isinstance(db_result, Exception):
+            db_result = f"DB Error: {db_result}"
 
-        # 3. Write to SQLite using the extracted metadata
-        db_result = db_manager.insert_incident(extracted_metadata, str(json_filename))
-        
         self._report_submitted = True
 
         if "Success" in db_result:
@@ -271,41 +371,48 @@ class IndicAssistant(agents.Agent):
             pass
         return "Disconnecting call. Stay safe."
 
+def prewarm(proc: JobProcess):
+    """Load the VAD once per worker process and share it across jobs."""
+    # Shorter silence window ends the caller's turn sooner (default is ~0.55s)
+    proc.userdata["vad"] = silero.VAD.load(
+        min_speech_duration=0.05,
+        min_silence_duration=0.25,
+        activation_threshold=0.5,
+    )
+
+
 # change stt, llm, tts to use local hosted models. currently using cloud models.
 async def entrypoint(ctx: JobContext):
     session = AgentSession(
         stt="deepgram/nova-3:multi",
         llm="openai/gpt-4.1-mini",
         tts="cartesia/sonic-3:9626c31c-bec5-4cca-baa8-f8ba9e84c8bc",
-        vad=silero.VAD.load(),
+        vad=ctx.proc.userdata["vad"],
         turn_detection="vad",
     )
     
     assistant = IndicAssistant()
+    # Release the plugins' pooled HTTP connections when the job ends
+    ctx.add_shutdown_callback(close_session)
         
     @session.on("user_input_transcribed")
     def on_user(evt):
         if evt.is_final:
-            assistant.conversation_history.append({
-                "role": "user",
-                "content": evt.transcript,
-                "timestamp": datetime.datetime.now().isoformat()
-            })
+            assistant.add_turn("user", evt.transcript)
             print(f"[USER] {evt.transcript}")
 
     @session.on("conversation_item_added")
     def on_agent(evt):
-        if hasattr(evt, 'item'):
-            if evt.item.role == 'assistant' and evt.item.text_content:
-                assistant.conversation_history.append({
-                    "role": "assistant",
-                    "content": evt.item.text_content,
-                    "timestamp": datetime.datetime.now().isoformat()
-                })
-                print(f"[AGENT] {evt.item.text_content}")
-            
-            if evt.item.type == "function_call":
-                print(f"[TOOL CALL] {evt.item.name}")
+        item = getattr(evt, "item", None)
+        if item is None:
+            return
+        if item.type == "function_call":
+            print(f"[TOOL CALL] {item.name}")
+        elif item.role == 'assistant':
+            text = item.text_content
+            if text:
+                assistant.add_turn("assistant", text)
+                print(f"[AGENT] {text}")
 
     await session.start(
         room=ctx.room,
@@ -322,4 +429,4 @@ async def entrypoint(ctx: JobContext):
     
     
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
\ No newline at end of file
+    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Shared aiohttp session for the HTTP-backed STT/TTS plugins.
+
+Every plugin talks to a handful of local model servers, so one pooled
+session per event loop keeps connections warm across utterances instead
+of each plugin instance opening its own pool.
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+
+# orjson is optional; aiohttp's json= bodies use the stdlib encoder without it
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    _json_dumps = json.dumps
+
+logger = logging.getLogger("plugins-http")
+
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide ClientSession, creating it on first use."""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=32,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+            ),
+            # Per-request timeouts are set by each plugin
+            timeout=aiohttp.ClientTimeout(total=None),
+            json_serialize=_json_dumps,
+            # StreamReader buffer limit (default 64 KiB): the transport is paused
+            # once this much is unread, so a lagging consumer's readany() /
+            # iter_any() calls return larger chunks instead of stalling the socket
+            read_bufsize=1 << 20,
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared session; call once on application shutdown."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("Shared HTTP session closed")
+    _session = None
+    _session_loop = None
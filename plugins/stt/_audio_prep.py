@@ -0,0 +1,93 @@
+"""Audio preparation shared by the HTTP STT plugins.
+
+Turns a LiveKit AudioBuffer into 16 kHz mono int16 PCM and wraps it as a
+WAV upload body.
+"""
+
+import struct
+
+import numpy as np
+from livekit import rtc
+from livekit.agents.utils import AudioBuffer
+
+# soxr (vectorised polyphase resampler) is optional; fall back to livekit's
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
+TARGET_SAMPLE_RATE = 16000
+
+# livekit resamplers keyed by input rate; the rate rarely changes within a session
+_resamplers: dict[int, rtc.AudioResampler] = {}
+
+
+def _wav_header(num_samples: int, sample_rate: int = TARGET_SAMPLE_RATE) -> bytes:
+    """44-byte RIFF header for mono 16-bit PCM."""
+    data_len = num_samples * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_len, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", data_len,
+    )
+
+
+def _get_resampler(input_rate: int) -> rtc.AudioResampler:
+    resampler = _resamplers.get(input_rate)
+    if resampler is None:
+        resampler = rtc.AudioResampler(
+            input_rate=input_rate,
+            output_rate=TARGET_SAMPLE_RATE,
+            num_channels=1
+        )
+        _resamplers[input_rate] = resampler
+    return resampler
+
+
+def frames_to_mono16k(buffer: AudioBuffer) -> np.ndarray:
+    """Downmix and resample an AudioBuffer to 16 kHz mono int16.
+
+    Returns an empty array when the buffer holds no audio frames.
+    """
+    frames = buffer if isinstance(buffer, list) else [buffer]
+    audio_chunks = []
+    sample_rate = TARGET_SAMPLE_RATE
+
+    for frame in frames:
+        if isinstance(frame, rtc.AudioFrame):
+            sample_rate = frame.sample_rate
+            # frame.data is already an int16 memoryview; view it without copying
+            pcm = np.frombuffer(frame.data, dtype=np.int16)
+            if frame.num_channels == 2:
+                # Integer downmix: average L/R in int32, no float64 round-trip
+                pcm = ((pcm[0::2].astype(np.int32) + pcm[1::2]) >> 1).astype(np.int16)
+            audio_chunks.append(pcm)
+
+    if not audio_chunks:
+        return np.zeros(0, dtype=np.int16)
+
+    # A single chunk (short utterance) needs no concatenation copy
+    audio_data = audio_chunks[0] if len(audio_chunks) == 1 else np.concatenate(audio_chunks)
+
+    if sample_rate == TARGET_SAMPLE_RATE:
+        return audio_data
+    if soxr is not None:
+        return soxr.resample(audio_data, sample_rate, TARGET_SAMPLE_RATE)
+
+    resampler = _get_resampler(sample_rate)
+    frame = rtc.AudioFrame(
+        data=audio_data.tobytes(),
+        sample_rate=sample_rate,
+        num_channels=1,
+        samples_per_channel=len(audio_data)
+    )
+    resampled = resampler.push(frame) + resampler.flush()
+    if resampled:
+        audio_data = np.concatenate([np.frombuffer(f.data, dtype=np.int16) for f in resampled])
+    return audio_data
+
+
+def mono16k_to_wav_bytes(pcm: np.ndarray) -> bytes:
+    """Wrap 16 kHz mono int16 PCM in a WAV container."""
+    return _wav_header(len(pcm)) + pcm.tobytes()
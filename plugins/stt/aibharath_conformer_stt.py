@@ -4,8 +4,6 @@ Connects to the AIBharath STT HTTP service for transcription.
 """
 
 import os
-import io
-import wave
 import logging
 import time
 from dataclasses import dataclass
@@ -17,20 +15,20 @@ DEBUG_FLOW = os.getenv("DEBUG_FLOW", "false").lower() == "true"
 
 import aiohttp
 import numpy as np
-from livekit import rtc
 from livekit.agents import stt, utils
 from livekit.agents.types import NOT_GIVEN, NotGivenOr
 from livekit.agents.utils import AudioBuffer
 from livekit.agents import APIConnectOptions, DEFAULT_API_CONNECT_OPTIONS
 
+from .._http import get_session
+from ._audio_prep import TARGET_SAMPLE_RATE, frames_to_mono16k, mono16k_to_wav_bytes
+
 logger = logging.getLogger("aibharath-conformer-stt")
 
-SUPPORTED_LANGUAGES = [
+SUPPORTED_LANGUAGES = frozenset({
     "as", "bn", "brx", "doi", "gu", "hi", "kn", "kok", "ks", "mai",
     "ml", "mni", "mr", "ne", "or", "pa", "sa", "sat", "sd", "ta", "te", "ur"
-]
-
-TARGET_SAMPLE_RATE = 16000
+})
 
 
 @dataclass
@@ -61,7 +59,6 @@ class STT(stt.STT):
             decode_type=decode_type,
             translate_to_english=translate_to_english,
         )
-        self._session: aiohttp.ClientSession | None = None
 
     @property
     def model(self) -> str:
@@ -86,14 +83,7 @@ class STT(stt.STT):
             logger.info(f"STT translate_to_english updated to: {translate_to_english}")
 
     def _ensure_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-
-    async def aclose(self) -> None:
-        if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
+        return get_session()
 
     async def _recognize_impl(
         self,
@@ -102,65 +92,37 @@ class STT(stt.STT):
         language: NotGivenOr[str] = NOT_GIVEN,
         conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
     ) -> stt.SpeechEvent:
-        lang = language if not isinstance(language, type(NOT_GIVEN)) else self._opts.language
+        return await self._recognize_pcm(frames_to_mono16k(buffer), language=language)
 
-        frames = buffer if isinstance(buffer, list) else [buffer]
-        audio_chunks = []
-        sample_rate = TARGET_SAMPLE_RATE
-
-        for frame in frames:
-            if isinstance(frame, rtc.AudioFrame):
-                sample_rate = frame.sample_rate
-                pcm = np.frombuffer(bytes(frame.data), dtype=np.int16)
-                if frame.num_channels == 2:
-                    pcm = pcm.reshape(-1, 2).mean(axis=1).astype(np.int16)
-                audio_chunks.append(pcm)
+    async def _recognize_pcm(
+        self,
+        audio_data: np.ndarray,
+        *,
+        language: NotGivenOr[str] = NOT_GIVEN,
+    ) -> stt.SpeechEvent:
+        """Transcribe audio already converted to 16 kHz mono int16."""
+        lang = self._opts.language if language is NOT_GIVEN else language
 
-        if not audio_chunks:
+        if not len(audio_data):
             return stt.SpeechEvent(
                 type=stt.SpeechEventType.FINAL_TRANSCRIPT,
                 request_id=utils.shortuuid(),
                 alternatives=[stt.SpeechData(language=lang, text="")],
             )
 
-        audio_data = np.concatenate(audio_chunks)
-
-        # Resample to 16kHz if needed
-        if sample_rate != TARGET_SAMPLE_RATE:
-            resampler = rtc.AudioResampler(
-                input_rate=sample_rate,
-                output_rate=TARGET_SAMPLE_RATE,
-                num_channels=1
-            )
-            frame = rtc.AudioFrame(
-                data=audio_data.tobytes(),
-                sample_rate=sample_rate,
-                num_channels=1,
-                samples_per_channel=len(audio_data)
-            )
-            resampled = resampler.push(frame) + resampler.flush()
-            if resampled:
-                audio_data = np.frombuffer(b''.join(bytes(f.data) for f in resampled), dtype=np.int16)
-            sample_rate = TARGET_SAMPLE_RATE
-
+        sample_rate = TARGET_SAMPLE_RATE
         duration = len(audio_data) / sample_rate
         logger.info(f"STT input: {duration:.2f}s audio at {sample_rate}Hz")
 
         # Create WAV in memory
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, 'wb') as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(TARGET_SAMPLE_RATE)
-            wav_file.writeframes(audio_data.tobytes())
-        wav_buffer.seek(0)
+        wav_bytes = mono16k_to_wav_bytes(audio_data)
 
         # Send to HTTP service
         session = self._ensure_session()
         stt_start = time.time()
         try:
             form = aiohttp.FormData()
-            form.add_field('file', wav_buffer, filename='audio.wav', content_type='audio/wav')
+            form.add_field('file', wav_bytes, filename='audio.wav', content_type='audio/wav')
             form.add_field('language', lang)
             form.add_field('decode_type', self._opts.decode_type)
             form.add_field('translate', str(self._opts.translate_to_english).lower())
@@ -4,30 +4,43 @@ Uses VoxLingua107 for language detection with majority vote.
 Supports auto detection or fixed language mode.
 """
 
-import io
 import os
-import wave
 import time
+import asyncio
+import contextlib
 import logging
 from collections import Counter
 from dataclasses import dataclass, field
 
 import aiohttp
 import numpy as np
-from livekit import rtc
 from livekit.agents import stt, utils
 from livekit.agents.types import NOT_GIVEN, NotGivenOr
 from livekit.agents.utils import AudioBuffer
 from livekit.agents import APIConnectOptions, DEFAULT_API_CONNECT_OPTIONS
 
+from .._http import get_session
+
 from .whisper_stt import STT as WhisperSTT
 from .aibharath_conformer_stt import STT as AIBharathSTT, SUPPORTED_LANGUAGES
+from ._audio_prep import TARGET_SAMPLE_RATE, frames_to_mono16k, mono16k_to_wav_bytes
 
 logger = logging.getLogger("language-routing-stt")
 
-INDIAN_LANGUAGES = set(SUPPORTED_LANGUAGES)
+INDIAN_LANGUAGES = frozenset(SUPPORTED_LANGUAGES)
 MIN_DETECTIONS_FOR_LOCK = 3  # Majority vote after 3 detections
-TARGET_SAMPLE_RATE = 16000
+EARLY_LOCK_MARGIN = 2  # Lock sooner once the leader is this many votes ahead
+
+
+async def _cancel_and_wait(task: asyncio.Task) -> None:
+    """Cancel a speculative request and wait for it to unwind.
+
+    Awaiting lets the aiohttp response context exit, so the connection is
+    released to the shared connector instead of being left to the GC.
+    """
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
 
 
 @dataclass
@@ -49,6 +62,8 @@ class STT(stt.STT):
         aibharath_url: str = "http://localhost:8002",
         language_mode: str = "auto",  # "auto" or specific: "kn", "hi", "en", etc.
         translate_to_english: bool = True,
+        min_detect_peak: int = 150,  # int16 peak below this counts as silence
+        min_detect_ms: int = 250,  # shorter buffers are too short to classify
     ) -> None:
         super().__init__(
             capabilities=stt.STTCapabilities(streaming=False, interim_results=False)
@@ -60,9 +75,10 @@ class STT(stt.STT):
             translate_to_english=translate_to_english
         )
         self._aibharath_url = aibharath_url
+        self._min_detect_peak = min_detect_peak
+        self._min_detect_ms = min_detect_ms
         self._language_mode = language_mode
         self._state = RoutingState()
-        self._session: aiohttp.ClientSession | None = None
 
         # If fixed language, lock immediately
         if language_mode != "auto":
@@ -73,67 +89,38 @@ class STT(stt.STT):
             logger.info(f"Fixed language mode: {language_mode} (AIBharath: {self._state.use_aibharath})")
 
     def _ensure_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        return get_session()
 
     async def aclose(self) -> None:
         await self._whisper.aclose()
         await self._aibharath.aclose()
-        if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
 
-    async def _detect_language_voxlingua(self, buffer: AudioBuffer) -> str | None:
+    def _is_detectable(self, audio_data: np.ndarray) -> bool:
+        """False for VAD residue that is too short or near-silent to classify."""
+        # Peak is estimated on every 8th sample; max/min avoids abs() overflow.
+        if not len(audio_data) or len(audio_data) * 1000 < TARGET_SAMPLE_RATE * self._min_detect_ms:
+            logger.debug(f"Skipping VoxLingua107: {len(audio_data)} samples is too short")
+            return False
+        decimated = audio_data[::8]
+        peak = max(int(decimated.max()), -int(decimated.min()))
+        if peak < self._min_detect_peak:
+            logger.debug(f"Skipping VoxLingua107: near-silent buffer (peak {peak})")
+            return False
+        return True
+
+    async def _detect_language_voxlingua(self, audio_data: np.ndarray) -> str | None:
         """Detect language using VoxLingua107 via HTTP API."""
-        frames = buffer if isinstance(buffer, list) else [buffer]
-        audio_chunks = []
-        sample_rate = TARGET_SAMPLE_RATE
-
-        for frame in frames:
-            if isinstance(frame, rtc.AudioFrame):
-                sample_rate = frame.sample_rate
-                pcm = np.frombuffer(bytes(frame.data), dtype=np.int16)
-                if frame.num_channels == 2:
-                    pcm = pcm.reshape(-1, 2).mean(axis=1).astype(np.int16)
-                audio_chunks.append(pcm)
-
-        if not audio_chunks:
-            return None
-
-        audio_data = np.concatenate(audio_chunks)
-
-        # Resample to 16kHz if needed
-        if sample_rate != TARGET_SAMPLE_RATE:
-            resampler = rtc.AudioResampler(
-                input_rate=sample_rate,
-                output_rate=TARGET_SAMPLE_RATE,
-                num_channels=1
-            )
-            frame = rtc.AudioFrame(
-                data=audio_data.tobytes(),
-                sample_rate=sample_rate,
-                num_channels=1,
-                samples_per_channel=len(audio_data)
-            )
-            resampled = resampler.push(frame) + resampler.flush()
-            if resampled:
-                audio_data = np.frombuffer(b''.join(bytes(f.data) for f in resampled), dtype=np.int16)
+        if self._state.locked_language:
+            return self._state.locked_language
 
         # Create WAV in memory
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, 'wb') as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(TARGET_SAMPLE_RATE)
-            wav_file.writeframes(audio_data.tobytes())
-        wav_buffer.seek(0)
+        wav_bytes = mono16k_to_wav_bytes(audio_data)
 
         # Call VoxLingua107 API
         session = self._ensure_session()
         try:
             form = aiohttp.FormData()
-            form.add_field('file', wav_buffer, filename='audio.wav', content_type='audio/wav')
+            form.add_field('file', wav_bytes, filename='audio.wav', content_type='audio/wav')
 
             async with session.post(
                 f"{self._aibharath_url}/detect-language",
@@ -162,13 +149,26 @@ class STT(stt.STT):
         conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
     ) -> stt.SpeechEvent:
         state = self._state
+        # Resample once; detection and both STT backends share the array
+        audio_data = frames_to_mono16k(buffer)
 
         # If language already locked, use appropriate STT
         if state.locked_language:
-            return await self._transcribe_with_locked(buffer, conn_options)
+            return await self._transcribe_with_locked(audio_data)
+
+        # Nothing to classify: transcribe as an unknown language, no vote
+        if not self._is_detectable(audio_data):
+            return await self._whisper._recognize_pcm(audio_data)
 
-        # Detection phase: Use VoxLingua107 for language detection
-        detected = await self._detect_language_voxlingua(buffer)
+        # Detection phase: run VoxLingua107 and a speculative Whisper pass
+        # together so detection latency hides behind transcription
+        detect_task = asyncio.create_task(self._detect_language_voxlingua(audio_data))
+        whisper_task = asyncio.create_task(self._whisper._recognize_pcm(audio_data))
+        try:
+            detected = await detect_task
+        except BaseException:
+            await _cancel_and_wait(whisper_task)
+            raise
         is_indian = detected in INDIAN_LANGUAGES if detected else False
 
         if detected:
@@ -176,49 +176,50 @@ class STT(stt.STT):
             state.detection_count += 1
             logger.info(f"Detection #{state.detection_count}: {detected} (indian: {is_indian}, counts: {dict(state.language_counts)})")
 
-            # Check if we have enough detections for majority vote
-            if state.detection_count >= MIN_DETECTIONS_FOR_LOCK:
+            # Lock on majority vote, or earlier once the leader can't be caught
+            most = state.language_counts.most_common(2)
+            lead = most[0][1] - (most[1][1] if len(most) > 1 else 0)
+            if state.detection_count >= MIN_DETECTIONS_FOR_LOCK or lead >= EARLY_LOCK_MARGIN:
                 self._lock_language()
 
         # Route based on current detection (not just after locking)
         # This ensures correct STT is used even during detection phase
         if state.locked_language:
-            return await self._transcribe_with_locked(buffer, conn_options)
+            return await self._transcribe_with_locked(audio_data, whisper_task)
         elif is_indian:
             # Indian language detected → use AIBharath Conformer
+            await _cancel_and_wait(whisper_task)
             self._aibharath.update_options(language=detected)
             logger.info(f"Routing to AIBharath (detected: {detected})")
-            return await self._aibharath._recognize_impl(buffer, conn_options=conn_options)
+            return await self._aibharath._recognize_pcm(audio_data)
         else:
-            # Non-Indian or unknown → try Whisper, fallback to AIBharath
-            try:
-                return await self._whisper._recognize_impl(buffer, conn_options=conn_options)
-            except Exception as e:
-                logger.warning(f"Whisper failed, falling back to AIBharath: {e}")
-                return await self._aibharath._recognize_impl(buffer, conn_options=conn_options)
+            # Non-Indian or unknown → use the speculative Whisper result
+            return await whisper_task
 
     def _lock_language(self) -> None:
         """Lock to a language based on majority vote, preferring Indian languages on tie."""
         state = self._state
         counts = state.language_counts
 
-        # Separate Indian and non-Indian languages
-        indian_counts = {k: v for k, v in counts.items() if k in INDIAN_LANGUAGES}
-        non_indian_counts = {k: v for k, v in counts.items() if k not in INDIAN_LANGUAGES}
-
-        # Get max votes for each category
-        max_indian = max(indian_counts.values()) if indian_counts else 0
-        max_non_indian = max(non_indian_counts.values()) if non_indian_counts else 0
+        # Track the leading Indian and non-Indian language in one pass
+        best_indian, max_indian = None, 0
+        best_other, max_other = None, 0
+        for lang, count in counts.items():
+            if lang in INDIAN_LANGUAGES:
+                if count > max_indian:
+                    best_indian, max_indian = lang, count
+            elif count > max_other:
+                best_other, max_other = lang, count
 
         # Prefer Indian language if it has equal or more votes
-        if max_indian >= max_non_indian and indian_counts:
-            most_common = max(indian_counts, key=indian_counts.get)
+        if best_indian is not None and max_indian >= max_other:
+            most_common = best_indian
             state.use_aibharath = True
-        elif non_indian_counts:
-            most_common = max(non_indian_counts, key=non_indian_counts.get)
+        elif best_other is not None:
+            most_common = best_other
             state.use_aibharath = False
         else:
-            most_common = counts.most_common(1)[0][0]
+            most_common = next(iter(counts))
             state.use_aibharath = most_common in INDIAN_LANGUAGES
 
         state.locked_language = most_common
@@ -231,12 +232,17 @@ class STT(stt.STT):
 
     async def _transcribe_with_locked(
         self,
-        buffer: AudioBuffer,
-        conn_options: APIConnectOptions,
+        audio_data: np.ndarray,
+        whisper_task: asyncio.Task | None = None,
     ) -> stt.SpeechEvent:
+        """Transcribe with the locked STT, reusing a speculative Whisper pass if given."""
         if self._state.use_aibharath:
-            return await self._aibharath._recognize_impl(buffer, conn_options=conn_options)
-        return await self._whisper._recognize_impl(buffer, conn_options=conn_options)
+            if whisper_task is not None:
+                await _cancel_and_wait(whisper_task)
+            return await self._aibharath._recognize_pcm(audio_data)
+        if whisper_task is not None:
+            return await whisper_task
+        return await self._whisper._recognize_pcm(audio_data)
 
     @property
     def detected_language(self) -> str | None:
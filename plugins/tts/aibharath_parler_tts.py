@@ -10,8 +10,13 @@ from dataclasses import dataclass
 import aiohttp
 from livekit.agents import tts, APIConnectOptions, DEFAULT_API_CONNECT_OPTIONS
 
+from .._http import get_session
+
 logger = logging.getLogger("aibharath-tts")
 
+# Raw PCM doesn't compress; ask the server to skip content encoding
+_PCM_HEADERS = {"Accept-Encoding": "identity"}
+
 
 @dataclass
 class TTSOptions:
@@ -53,7 +58,6 @@ class TTS(tts.TTS):
             speed=speed,
             sample_rate=sample_rate,
         )
-        self._session: aiohttp.ClientSession | None = None
 
     def update_options(self, *, language: str | None = None, speaker: str | None = None):
         """Update language/speaker for multilanguage support."""
@@ -63,13 +67,7 @@ class TTS(tts.TTS):
             self._opts.speaker = speaker
 
     def _ensure_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-
-    async def aclose(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        return get_session()
 
     def synthesize(
         self,
@@ -110,6 +108,7 @@ class ChunkedStream(tts.ChunkedStream):
                 "speed": self._opts.speed,
                 "output_format": "pcm",
             },
+            headers=_PCM_HEADERS,
             timeout=aiohttp.ClientTimeout(total=60),
         ) as resp:
             if resp.status != 200:
@@ -128,21 +127,19 @@ class ChunkedStream(tts.ChunkedStream):
             )
 
             total_bytes = 0
-            chunk_count = 0
-            async for chunk in resp.content.iter_chunked(8192):  # 8KB chunks
-                if chunk:
-                    output_emitter.push(chunk)
-                    total_bytes += len(chunk)
-                    chunk_count += 1
-                    if chunk_count == 1:
-                        logger.info(f"TTS first chunk received ({len(chunk)} bytes), starting playback")
-                    elif chunk_count % 10 == 0:
-                        logger.debug(f"TTS chunk {chunk_count}: {total_bytes} bytes total")
+            first = True
+            # iter_any() hands over whatever the socket has, without re-slicing
+            async for chunk in resp.content.iter_any():
+                output_emitter.push(chunk)
+                total_bytes += len(chunk)
+                if first:
+                    first = False
+                    logger.info(f"TTS first chunk received ({len(chunk)} bytes), starting playback")
 
             # Flush buffered audio before returning
             output_emitter.flush()
             duration_sec = total_bytes / 2 / sample_rate  # int16 = 2 bytes
-            logger.info(f"TTS streaming complete: {total_bytes} bytes ({duration_sec:.2f}s) in {chunk_count} chunks")
+            logger.info(f"TTS streaming complete: {total_bytes} bytes ({duration_sec:.2f}s)")
 
     async def _run_non_streaming(self, session, output_emitter, text_preview):
         """Wait for full audio before pushing."""
@@ -157,6 +154,7 @@ class ChunkedStream(tts.ChunkedStream):
                 "speed": self._opts.speed,
                 "output_format": "pcm",
             },
+            headers=_PCM_HEADERS,
             timeout=aiohttp.ClientTimeout(total=30),
         ) as resp:
             if resp.status != 200:
@@ -13,13 +13,17 @@ import os
 import logging
 import uuid
 import io
+import struct
 import wave
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Optional
 
 import aiohttp
 from livekit.agents import tts, APIConnectOptions, DEFAULT_API_CONNECT_OPTIONS
 
+from .._http import get_session
+
 logger = logging.getLogger("indic-tts")
 
 # API Configuration
@@ -37,7 +41,7 @@ SUPPORTED_LANGUAGES = {
 }
 
 # Direct language mapping (all supported natively)
-LANG_ROUTING = {
+LANG_ROUTING = MappingProxyType({
     "en": "en",
     "hi": "hi",
     "kn": "kn",
@@ -45,7 +49,7 @@ LANG_ROUTING = {
     "mr": "mr",
     "ta": "ta",
     "te": "te",
-}
+})
 
 
 def get_routed_language(lang_code: str) -> Optional[str]:
@@ -56,6 +60,33 @@ def is_language_supported(lang_code: str) -> bool:
     return lang_code in LANG_ROUTING
 
 
+def _parse_wav_header(buf: bytes) -> tuple[int, int, int] | None:
+    """Locate the PCM payload in a RIFF/WAVE buffer.
+
+    Returns (sample_rate, data_offset, data_len), or None if the buffer ends
+    before the 'data' chunk header. Raises ValueError for non-WAV input.
+    """
+    if len(buf) < 12:
+        return None
+    if buf[0:4] != b"RIFF" or buf[8:12] != b"WAVE":
+        raise ValueError("not a RIFF/WAVE stream")
+    sample_rate = None
+    offset = 12
+    while offset + 8 <= len(buf):
+        chunk_id, chunk_len = struct.unpack_from("<4sI", buf, offset)
+        if chunk_id == b"fmt ":
+            if offset + 16 > len(buf):
+                return None
+            sample_rate = struct.unpack_from("<I", buf, offset + 12)[0]
+        elif chunk_id == b"data":
+            if sample_rate is None:
+                raise ValueError("'data' chunk before 'fmt ' chunk")
+            return sample_rate, offset + 8, chunk_len
+        # Chunks are word-aligned
+        offset += 8 + chunk_len + (chunk_len & 1)
+    return None
+
+
 @dataclass
 class IndicTTSOptions:
     base_url: str = INDIC_TTS_URL
@@ -89,7 +120,6 @@ class TTS(tts.TTS):
             language=routed_lang,
             speaker=speaker,
         )
-        self._session: Optional[aiohttp.ClientSession] = None
 
     def update_options(
         self,
@@ -110,14 +140,7 @@ class TTS(tts.TTS):
             logger.info(f"Indic TTS speaker updated to: {speaker}")
 
     def _ensure_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-
-    async def aclose(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
+        return get_session()
 
     def synthesize(
         self,
@@ -168,21 +191,56 @@ class IndicTTSStream(tts.ChunkedStream):
                     error = await resp.text()
                     raise Exception(f"TTS API error {resp.status}: {error}")
 
-                wav_data = await resp.read()
-
-                # Parse WAV to get PCM data
-                with io.BytesIO(wav_data) as wav_buffer:
-                    with wave.open(wav_buffer, 'rb') as wav_file:
-                        sample_rate = wav_file.getframerate()
-                        pcm_data = wav_file.readframes(wav_file.getnframes())
-
-                output_emitter.initialize(
-                    request_id=str(uuid.uuid4()),
-                    sample_rate=sample_rate,
-                    num_channels=1,
-                    mime_type="audio/pcm",
-                )
-                output_emitter.push(pcm_data)
+                # Buffer only until the 'data' chunk header is seen, then
+                # stream the PCM through as it arrives
+                header_buf = bytearray()
+                remaining = None  # PCM bytes left, None when length is unknown
+                started = False
+                async for chunk in resp.content.iter_any():
+                    if not started:
+                        header_buf += chunk
+                        try:
+                            header = _parse_wav_header(header_buf)
+                        except (struct.error, ValueError):
+                            header = None
+                            break
+                        if header is None:
+                            continue
+                        sample_rate, data_offset, data_len = header
+                        output_emitter.initialize(
+                            request_id=str(uuid.uuid4()),
+                            sample_rate=sample_rate,
+                            num_channels=1,
+                            mime_type="audio/pcm",
+                        )
+                        started = True
+                        # Streaming servers leave the size as 0 or 0xFFFFFFFF
+                        if data_len not in (0, 0xFFFFFFFF):
+                            remaining = data_len
+                        chunk = bytes(header_buf[data_offset:])
+                        header_buf = None
+                    if remaining is not None:
+                        chunk = chunk[:remaining]
+                        remaining -= len(chunk)
+                    if chunk:
+                        output_emitter.push(chunk)
+                    if remaining == 0:
+                        break
+
+                if not started:
+                    # Non-canonical WAV: read the rest and let wave parse it
+                    header_buf += await resp.read()
+                    with io.BytesIO(header_buf) as wav_buffer:
+                        with wave.open(wav_buffer, 'rb') as wav_file:
+                            sample_rate = wav_file.getframerate()
+                            pcm_data = wav_file.readframes(wav_file.getnframes())
+                    output_emitter.initialize(
+                        request_id=str(uuid.uuid4()),
+                        sample_rate=sample_rate,
+                        num_channels=1,
+                        mime_type="audio/pcm",
+                    )
+                    output_emitter.push(pcm_data)
 
         except Exception as e:
             logger.error(f"Indic TTS synthesis failed: {e}")
@@ -13,6 +13,8 @@ from dataclasses import dataclass
 import aiohttp
 from livekit.agents import tts, APIConnectOptions, DEFAULT_API_CONNECT_OPTIONS
 
+from .._http import get_session
+
 logger = logging.getLogger("kokoro-tts")
 
 SAMPLE_RATE = 24000
@@ -41,7 +43,6 @@ class TTS(tts.TTS):
             num_channels=1,
         )
         self._opts = KokoroOptions(base_url=base_url, voice=voice, speed=speed)
-        self._session: aiohttp.ClientSession | None = None
 
     def update_options(self, *, voice: str | None = None, speed: float | None = None):
         """Update voice/speed dynamically."""
@@ -51,13 +52,7 @@ class TTS(tts.TTS):
             self._opts.speed = speed
 
     def _ensure_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-
-    async def aclose(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        return get_session()
 
     def synthesize(
         self,
@@ -86,8 +81,11 @@ class KokoroStream(tts.ChunkedStream):
 
     async def _run(self, output_emitter):
         session = self._tts._ensure_session()
-        text_preview = self._input_text[:50].replace('\n', ' ')
-        logger.info(f"Kokoro TTS request: '{text_preview}' [voice={self._opts.voice}]")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Kokoro TTS request: '%s' [voice=%s]",
+                self._input_text[:50].replace('\n', ' '), self._opts.voice,
+            )
 
         async with session.post(
             f"{self._opts.base_url}/v1/audio/speech",
@@ -101,7 +99,10 @@ class KokoroStream(tts.ChunkedStream):
             timeout=aiohttp.ClientTimeout(total=60),
         ) as resp:
             if resp.status != 200:
-                error = await resp.text()
+                # Only the head of the body: error pages can be arbitrarily large
+                error = (await resp.content.read(1024)).decode("utf-8", errors="replace")
+                if not resp.content.at_eof():
+                    error += " ...[truncated]"
                 logger.error(f"Kokoro TTS error {resp.status}: {error}")
                 raise tts.TTSError(f"Kokoro TTS error: {resp.status}")
 
@@ -112,16 +113,19 @@ class KokoroStream(tts.ChunkedStream):
                 mime_type="audio/pcm",
             )
 
+            # First chunk handled up front so the streaming loop stays branch-free
             total_bytes = 0
-            chunk_count = 0
-            async for chunk in resp.content.iter_chunked(4096):
-                if chunk:
-                    output_emitter.push(chunk)
-                    total_bytes += len(chunk)
-                    chunk_count += 1
-                    if chunk_count == 1:
-                        logger.info(f"Kokoro first chunk ({len(chunk)} bytes)")
+            chunk = await resp.content.readany()
+            if chunk:
+                logger.info("Kokoro first chunk (%d bytes)", len(chunk))
+                output_emitter.push(chunk)
+                total_bytes = len(chunk)
+            # iter_any() hands over whatever the socket has, without re-slicing
+            async for chunk in resp.content.iter_any():
+                output_emitter.push(chunk)
+                total_bytes += len(chunk)
 
             output_emitter.flush()
-            duration = total_bytes / 2 / SAMPLE_RATE
-            logger.info(f"Kokoro TTS complete: {total_bytes} bytes ({duration:.2f}s)")
+            if logger.isEnabledFor(logging.INFO):
+                duration = total_bytes / 2 / SAMPLE_RATE
+                logger.info("Kokoro TTS complete: %d bytes (%.2fs)", total_bytes, duration)
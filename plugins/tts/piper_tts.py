@@ -9,11 +9,14 @@ Models: https://huggingface.co/rhasspy/piper-voices
 Samples: https://rhasspy.github.io/piper-samples/
 """
 
+import asyncio
+import json
 import logging
+import os
+import threading
 import uuid
 import time
-import io
-import wave
+from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -39,6 +42,21 @@ def _load_piper():
     return PiperVoice, SynthesisConfig
 
 
+def _synthesize_chunks(voice, text: str, syn_config, loop, queue, stop) -> None:
+    """Blocking: feed int16 PCM to an asyncio queue as Piper yields it.
+
+    Piper yields one AudioChunk per sentence. None is queued at the end;
+    setting ``stop`` abandons the remaining sentences.
+    """
+    try:
+        for chunk in voice.synthesize(text, syn_config=syn_config):
+            if stop.is_set():
+                break
+            loop.call_soon_threadsafe(queue.put_nowait, chunk.audio_int16_bytes)
+    finally:
+        loop.call_soon_threadsafe(queue.put_nowait, None)
+
+
 # Available Indian language voices in Piper
 # Format: {voice_id}: {model_name, display_name, lang_code}
 PIPER_VOICES = {
@@ -84,6 +102,75 @@ class PiperOptions:
     voice: str = "hi_rohan"
     use_cuda: bool = False
     length_scale: float = 1.0  # 1.0 = normal speed
+    # ORT intra-op threads per session; None splits the cores across the pool
+    num_threads: Optional[int] = None
+    # Independent sessions per voice; size it to the expected concurrent calls.
+    # Callers beyond the pool wait for a session to be returned.
+    pool_size: int = 1
+
+
+def _session_threads(opts: PiperOptions) -> int:
+    """Intra-op threads for each pooled session, resolved at load time."""
+    if opts.num_threads:
+        return opts.num_threads
+    return max(1, (os.cpu_count() or 1) // opts.pool_size)
+
+
+def _load_voice(model_path: Path, opts: PiperOptions):
+    """Load a Piper voice on an ONNX Runtime session we configure ourselves.
+
+    PiperVoice.load() uses default SessionOptions, where ORT picks half the
+    cores for intra-op work; build the session here so the count is ours.
+    """
+    PV, _ = _load_piper()
+    import onnxruntime
+    from piper.config import PiperConfig
+
+    with open(f"{model_path}.json", "r", encoding="utf-8") as config_file:
+        config = PiperConfig.from_dict(json.load(config_file))
+
+    sess_options = onnxruntime.SessionOptions()
+    sess_options.intra_op_num_threads = _session_threads(opts)
+    sess_options.inter_op_num_threads = 1
+    sess_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+
+    # ORT re-runs its graph optimizations on every load; on CPU save the
+    # optimized graph beside the model (keyed by ORT version) and load that
+    # with optimizations off next time. CUDA graphs are device-specific.
+    load_path, cache_tmp = model_path, None
+    if not opts.use_cuda:
+        cached = model_path.with_name(f"{model_path.stem}.ort-{onnxruntime.__version__}.onnx")
+        if cached.exists():
+            load_path = cached
+            sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+        elif os.access(model_path.parent, os.W_OK):
+            cache_tmp = cached.with_name(f"{cached.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+            sess_options.optimized_model_filepath = str(cache_tmp)
+
+    if opts.use_cuda:
+        providers = [
+            ("CUDAExecutionProvider", {
+                "device_id": 0,
+                "arena_extend_strategy": "kNextPowerOfTwo",
+                # Input length changes every sentence; EXHAUSTIVE would
+                # re-benchmark each new shape, HEURISTIC picks without timing
+                "cudnn_conv_algo_search": "HEURISTIC",
+                "do_copy_in_default_stream": True,
+            }),
+            "CPUExecutionProvider",
+        ]
+    else:
+        providers = ["CPUExecutionProvider"]
+
+    session = onnxruntime.InferenceSession(
+        str(load_path), sess_options=sess_options, providers=providers
+    )
+    if cache_tmp is not None and cache_tmp.exists():
+        # Atomic rename: concurrent pool loads never see a partial file
+        os.replace(cache_tmp, cached)
+    if opts.use_cuda and "CUDAExecutionProvider" not in session.get_providers():
+        logger.warning(f"CUDA unavailable for {model_path.name}, running Piper on CPU")
+    return PV(config=config, session=session)
 
 
 class TTS(tts.TTS):
@@ -96,6 +183,8 @@ class TTS(tts.TTS):
         voice: str = "hi_rohan",
         use_cuda: bool = False,
         length_scale: float = 1.0,
+        num_threads: Optional[int] = None,
+        pool_size: int = 1,
     ):
         # Piper outputs 22050 Hz audio
         super().__init__(
@@ -108,23 +197,41 @@ class TTS(tts.TTS):
             voice=voice,
             use_cuda=use_cuda,
             length_scale=length_scale,
+            num_threads=num_threads,
+            pool_size=max(1, pool_size),
         )
-        self._voice_cache: dict[str, any] = {}
-
-    def _get_voice(self, voice_id: str):
-        """Load and cache voice model."""
-        if voice_id in self._voice_cache:
-            return self._voice_cache[voice_id]
-
-        PV, _ = _load_piper()
-
-        voice_info = PIPER_VOICES.get(voice_id)
-        if not voice_info:
+        # Per voice, a queue of loaded PiperVoice instances; a stream checks
+        # one out for exclusive use so concurrent calls don't share a session
+        self._voice_pools: dict[str, asyncio.Queue] = {}
+        # One lock per voice so concurrent first calls share a single load
+        self._voice_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._syn_configs: dict[float, any] = {}  # SynthesisConfig by length_scale
+
+    async def _get_voice_pool(self, voice_id: str) -> asyncio.Queue:
+        """Load and cache the pool of voice models for a voice ID."""
+        if voice_id not in PIPER_VOICES:
             logger.warning(f"Unknown voice '{voice_id}', falling back to hi_rohan")
             voice_id = "hi_rohan"
-            voice_info = PIPER_VOICES[voice_id]
 
-        model_name = voice_info["model"]
+        pool = self._voice_pools.get(voice_id)
+        if pool is not None:
+            return pool
+        async with self._voice_locks[voice_id]:
+            pool = self._voice_pools.get(voice_id)
+            if pool is None:
+                # Model loading blocks; run it off the event loop
+                voices = await asyncio.gather(*(
+                    asyncio.to_thread(self._load_model, voice_id)
+                    for _ in range(self._opts.pool_size)
+                ))
+                pool = asyncio.Queue()
+                for voice in voices:
+                    pool.put_nowait(voice)
+                self._voice_pools[voice_id] = pool
+            return pool
+
+    def _load_model(self, voice_id: str):
+        model_name = PIPER_VOICES[voice_id]["model"]
         model_path = self._opts.models_dir / f"{model_name}.onnx"
 
         if not model_path.exists():
@@ -134,9 +241,43 @@ class TTS(tts.TTS):
             )
 
         logger.info(f"Loading Piper voice: {voice_id} from {model_path}")
-        voice = PV.load(str(model_path), use_cuda=self._opts.use_cuda)
-        self._voice_cache[voice_id] = voice
-        return voice
+        return _load_voice(model_path, self._opts)
+
+    def _get_syn_config(self):
+        """Return the cached SynthesisConfig for the current options."""
+        length_scale = self._opts.length_scale
+        syn_config = self._syn_configs.get(length_scale)
+        if syn_config is None:
+            _, SC = _load_piper()
+            syn_config = self._syn_configs[length_scale] = SC(length_scale=length_scale)
+        return syn_config
+
+    async def _warm_voice(self, voice_id: str) -> None:
+        pool = await self._get_voice_pool(voice_id)
+        syn_config = self._get_syn_config()
+
+        def _synthesize_throwaway(voice):
+            # A throwaway synthesis makes ORT allocate and pick kernels up front
+            for _ in voice.synthesize("ok", syn_config=syn_config):
+                pass
+
+        voices = [pool.get_nowait() for _ in range(pool.qsize())]
+        try:
+            await asyncio.gather(*(asyncio.to_thread(_synthesize_throwaway, v) for v in voices))
+        finally:
+            for voice in voices:
+                pool.put_nowait(voice)
+
+    async def warmup(self, voices: Optional[list[str]] = None):
+        """Preload voices so the first caller doesn't pay the cold-load stall.
+
+        Args:
+            voices: Voice IDs to warm (default: the configured voice). Pass
+                set(LANG_TO_VOICE.values()) to cover mid-call language switches.
+        """
+        voice_ids = dict.fromkeys(voices or [self._opts.voice])
+        await asyncio.gather(*(self._warm_voice(v) for v in voice_ids))
+        logger.info(f"Piper voices warmed: {', '.join(voice_ids)}")
 
     def update_options(
         self,
@@ -153,11 +294,12 @@ class TTS(tts.TTS):
         if voice:
             self._opts.voice = voice
             logger.info(f"Piper TTS voice updated to: {voice}")
-        if length_scale is not None:
+        if length_scale is not None and length_scale != self._opts.length_scale:
             self._opts.length_scale = length_scale
+            self._syn_configs.clear()
 
     async def aclose(self):
-        self._voice_cache.clear()
+        self._voice_pools.clear()
 
     def synthesize(
         self,
@@ -185,46 +327,52 @@ class PiperStream(tts.ChunkedStream):
         self._opts = opts
 
     async def _run(self, output_emitter):
-        _, SC = _load_piper()
-
-        text_preview = self._input_text[:50].replace('\n', ' ')
-        voice_info = PIPER_VOICES.get(self._opts.voice, PIPER_VOICES["hi_rohan"])
-        logger.info(f"Piper TTS: '{text_preview}...' [voice={self._opts.voice}]")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Piper TTS: '%s...' [voice=%s]",
+                self._input_text[:50].replace('\n', ' '), self._opts.voice,
+            )
 
         tts_start = time.time()
 
-        # Get the voice model
-        voice = self._tts._get_voice(self._opts.voice)
-
-        # Configure synthesis
-        syn_config = SC(length_scale=self._opts.length_scale)
-
-        # Synthesize to WAV in memory
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, "wb") as wav_file:
-            voice.synthesize_wav(self._input_text, wav_file, syn_config=syn_config)
-
-        # Extract PCM data from WAV
-        wav_buffer.seek(0)
-        with wave.open(wav_buffer, "rb") as wav_file:
-            sample_rate = wav_file.getframerate()
-            pcm_data = wav_file.readframes(wav_file.getnframes())
-
-        tts_end = time.time()
-        duration = len(pcm_data) / 2 / sample_rate  # 16-bit = 2 bytes per sample
-        logger.info(
-            f"[TIMING] Piper TTS: {(tts_end - tts_start)*1000:.0f}ms "
-            f"({len(self._input_text)} chars -> {duration:.2f}s audio)"
-        )
-
-        # Emit audio (framework calls end_input() automatically after _run completes)
-        output_emitter.initialize(
-            request_id=str(uuid.uuid4()),
-            sample_rate=sample_rate,
-            num_channels=1,
-            mime_type="audio/pcm",
-        )
-        output_emitter.push(pcm_data)
+        pool = await self._tts._get_voice_pool(self._opts.voice)
+        syn_config = self._tts._get_syn_config()
+        # Wait for a free session rather than oversubscribe a busy one
+        voice = await pool.get()
+
+        # Push each sentence as Piper produces it so playback can start after
+        # the first one (framework calls end_input() after _run)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        stop = threading.Event()
+        synth = asyncio.ensure_future(asyncio.to_thread(
+            _synthesize_chunks, voice, self._input_text, syn_config, loop, queue, stop
+        ))
+        # Return the voice only once its worker thread is done with it
+        synth.add_done_callback(lambda _: pool.put_nowait(voice))
+        total_bytes = 0
+        try:
+            sample_rate = voice.config.sample_rate
+            output_emitter.initialize(
+                request_id=str(uuid.uuid4()),
+                sample_rate=sample_rate,
+                num_channels=1,
+                mime_type="audio/pcm",
+            )
+            while (pcm_data := await queue.get()) is not None:
+                output_emitter.push(pcm_data)
+                total_bytes += len(pcm_data)
+            await synth  # surface synthesis errors
+        finally:
+            stop.set()
+
+        if logger.isEnabledFor(logging.INFO):
+            tts_end = time.time()
+            duration = total_bytes / 2 / sample_rate  # 16-bit = 2 bytes per sample
+            logger.info(
+                "[TIMING] Piper TTS: %.0fms (%d chars -> %.2fs audio)",
+                (tts_end - tts_start) * 1000, len(self._input_text), duration,
+            )
 
 
 def get_voice_for_lang(lang_code: str) -> str:
@@ -10,58 +10,82 @@ Model: kenpath/svara-tts-v1
 import logging
 import uuid
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from urllib.parse import quote_plus, urlencode
 
 import aiohttp
 from livekit.agents import tts, APIConnectOptions, DEFAULT_API_CONNECT_OPTIONS
 
+from .._http import get_session
+
 logger = logging.getLogger("svara-tts")
 
 SAMPLE_RATE = 24000
 
-# Language code to voice name mapping
-# Format: {lang_code}_{gender} -> "Language (Gender)"
-SVARA_VOICE_MAP = {
-    "hi_male": "Hindi (Male)",
-    "hi_female": "Hindi (Female)",
-    "kn_male": "Kannada (Male)",
-    "kn_female": "Kannada (Female)",
-    "ta_male": "Tamil (Male)",
-    "ta_female": "Tamil (Female)",
-    "te_male": "Telugu (Male)",
-    "te_female": "Telugu (Female)",
-    "bn_male": "Bengali (Male)",
-    "bn_female": "Bengali (Female)",
-    "mr_male": "Marathi (Male)",
-    "mr_female": "Marathi (Female)",
-    "gu_male": "Gujarati (Male)",
-    "gu_female": "Gujarati (Female)",
-    "ml_male": "Malayalam (Male)",
-    "ml_female": "Malayalam (Female)",
-    "pa_male": "Punjabi (Male)",
-    "pa_female": "Punjabi (Female)",
-    "en_male": "English (Male)",
-    "en_female": "English (Female)",
-    "as_male": "Assamese (Male)",
-    "as_female": "Assamese (Female)",
-    "ne_male": "Nepali (Male)",
-    "ne_female": "Nepali (Female)",
-    "sa_male": "Sanskrit (Male)",
-    "sa_female": "Sanskrit (Female)",
-    "or_male": "Odia (Male)",
-    "or_female": "Odia (Female)",
+# Languages with a male and a female Svara voice
+LANG_NAMES = {
+    "hi": "Hindi",
+    "kn": "Kannada",
+    "ta": "Tamil",
+    "te": "Telugu",
+    "bn": "Bengali",
+    "mr": "Marathi",
+    "gu": "Gujarati",
+    "ml": "Malayalam",
+    "pa": "Punjabi",
+    "en": "English",
+    "as": "Assamese",
+    "ne": "Nepali",
+    "sa": "Sanskrit",
+    "or": "Odia",
 }
+VALID_LANGS = frozenset(LANG_NAMES)
+GENDERS = ("male", "female")
+
+# Language code to voice name mapping, derived in one pass
+# Format: {lang_code}_{gender} -> "Language (Gender)"
+SVARA_VOICE_MAP = {}
+LANG_GENDER_TO_VOICE_ID = {}  # Reverse mapping for convenience
+for _lang, _name in LANG_NAMES.items():
+    for _gender in GENDERS:
+        _voice_id = f"{_lang}_{_gender}"
+        _voice_name = f"{_name} ({_gender.title()})"
+        SVARA_VOICE_MAP[_voice_id] = _voice_name
+        LANG_GENDER_TO_VOICE_ID[_voice_name] = _voice_id
+del _lang, _name, _gender, _voice_id, _voice_name
+
+
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
 
-# Reverse mapping for convenience
-LANG_GENDER_TO_VOICE_ID = {v: k for k, v in SVARA_VOICE_MAP.items()}
+
+def _encode_static_fields(voice_name: str) -> bytes:
+    """URL-encode the per-voice constant form fields once."""
+    return urlencode({
+        "voice": voice_name,
+        "model_id": "svara-tts-v1",
+        "stream": "true",
+        "response_format": "pcm",
+    }).encode()
 
 
 @dataclass
 class SvaraOptions:
     base_url: str = "http://localhost:8890"
     voice: str = "kn_male"  # Default to Kannada male
+    voice_name: str = field(init=False)  # Server-side name, resolved from voice
+    # Encoded form fields other than text; rebuilt when the voice changes
+    form_fields: bytes = field(init=False)
     response_format: str = "pcm"
 
+    def __post_init__(self):
+        self.set_voice(self.voice)
+
+    def set_voice(self, voice: str) -> None:
+        """Set the voice ID and derive the fields that depend on it."""
+        self.voice = voice
+        self.voice_name = SVARA_VOICE_MAP.get(voice, voice)
+        self.form_fields = _encode_static_fields(self.voice_name)
+
 
 class TTS(tts.TTS):
     """Svara TTS via REST API."""
@@ -78,7 +102,6 @@ class TTS(tts.TTS):
             num_channels=1,
         )
         self._opts = SvaraOptions(base_url=base_url, voice=voice)
-        self._session: aiohttp.ClientSession | None = None
 
     def update_options(self, *, voice: str | None = None):
         """Update voice dynamically.
@@ -87,17 +110,11 @@ class TTS(tts.TTS):
             voice: Voice ID in format "{lang}_{gender}" (e.g., "kn_male", "hi_female")
         """
         if voice:
-            self._opts.voice = voice
+            self._opts.set_voice(voice)
             logger.info(f"Svara TTS voice updated to: {voice}")
 
     def _ensure_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-
-    async def aclose(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        return get_session()
 
     def synthesize(
         self,
@@ -126,27 +143,26 @@ class SvaraStream(tts.ChunkedStream):
 
     async def _run(self, output_emitter):
         session = self._tts._ensure_session()
-        text_preview = self._input_text[:50].replace('\n', ' ')
-        text_len = len(self._input_text)
-
-        # Get the voice name from voice ID
-        voice_name = SVARA_VOICE_MAP.get(self._opts.voice, self._opts.voice)
-        logger.info(f"Svara TTS request: '{text_preview}' [voice={self._opts.voice} -> {voice_name}]")
+        voice_name = self._opts.voice_name
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Svara TTS request: '%s' [voice=%s -> %s]",
+                self._input_text[:50].replace('\n', ' '), self._opts.voice, voice_name,
+            )
 
         tts_start = time.time()
         async with session.post(
             f"{self._opts.base_url}/v1/text-to-speech",
-            data={
-                "text": self._input_text,
-                "voice": voice_name,
-                "model_id": "svara-tts-v1",
-                "stream": "true",
-                "response_format": "pcm",
-            },
+            # Only the text is encoded per request; the rest is cached per voice
+            data=b"text=" + quote_plus(self._input_text).encode() + b"&" + self._opts.form_fields,
+            headers=_FORM_HEADERS,
             timeout=aiohttp.ClientTimeout(total=120),
         ) as resp:
             if resp.status != 200:
-                error = await resp.text()
+                # Only the head of the body: error pages can be arbitrarily large
+                error = (await resp.content.read(1024)).decode("utf-8", errors="replace")
+                if not resp.content.at_eof():
+                    error += " ...[truncated]"
                 logger.error(f"Svara TTS error {resp.status}: {error}")
                 raise tts.TTSError(f"Svara TTS error: {resp.status}")
 
@@ -157,22 +173,26 @@ class SvaraStream(tts.ChunkedStream):
                 mime_type="audio/pcm",
             )
 
+            # First chunk handled up front so the streaming loop stays branch-free
             total_bytes = 0
-            chunk_count = 0
-            first_chunk_time = None
-            async for chunk in resp.content.iter_chunked(4096):
-                if chunk:
-                    output_emitter.push(chunk)
-                    total_bytes += len(chunk)
-                    chunk_count += 1
-                    if chunk_count == 1:
-                        first_chunk_time = time.time()
-                        logger.info(f"[TIMING] TTS first chunk: {(first_chunk_time - tts_start)*1000:.0f}ms")
+            chunk = await resp.content.readany()
+            if chunk:
+                logger.info("[TIMING] TTS first chunk: %.0fms", (time.time() - tts_start) * 1000)
+                output_emitter.push(chunk)
+                total_bytes = len(chunk)
+            # iter_any() hands over whatever the socket has, without re-slicing
+            async for chunk in resp.content.iter_any():
+                output_emitter.push(chunk)
+                total_bytes += len(chunk)
 
             output_emitter.flush()
-            tts_end = time.time()
-            duration = total_bytes / 2 / SAMPLE_RATE
-            logger.info(f"[TIMING] TTS complete: {(tts_end - tts_start)*1000:.0f}ms ({text_len} chars → {duration:.2f}s audio)")
+            if logger.isEnabledFor(logging.INFO):
+                tts_end = time.time()
+                duration = total_bytes / 2 / SAMPLE_RATE
+                logger.info(
+                    "[TIMING] TTS complete: %.0fms (%d chars → %.2fs audio)",
+                    (tts_end - tts_start) * 1000, len(self._input_text), duration,
+                )
 
 
 # Helper function to build voice ID from language and gender
@@ -186,8 +206,7 @@ def get_voice_id(lang_code: str, gender: str = "male") -> str:
     Returns:
         Voice ID like "kn_male"
     """
-    voice_id = f"{lang_code}_{gender}"
-    if voice_id not in SVARA_VOICE_MAP:
-        logger.warning(f"Unknown voice ID: {voice_id}, falling back to kn_male")
+    if lang_code not in VALID_LANGS or gender not in GENDERS:
+        logger.warning(f"Unknown voice ID: {lang_code}_{gender}, falling back to kn_male")
         return "kn_male"
-    return voice_id
+    return f"{lang_code}_{gender}"